@@ -1,3 +1,4 @@
+import contextlib
 import textwrap
 from pathlib import Path
 
@@ -7,6 +8,26 @@ from gale.data.projects import SHARED_PROJECT
 from gale.data.structs import Board, BuildCache, BuildType, Target, get_triplet
 from gale.util import CmdHandle, CmdMode, run_command
 
+_CODECHECKER_DIR: Path = SHARED_PROJECT.dir / "share" / "codechecker"
+"""Directory holding the shared CodeChecker configuration; static, so resolved once at import."""
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    """Atomically replace the content of the given file, unless it already holds exactly that content.
+
+    Leaving an up-to-date file (and thus its mtime) untouched keeps anything that watches it from seeing a bogus
+    change; returns whether the file was actually written.
+    """
+    with contextlib.suppress(FileNotFoundError):
+        if path.read_text() == content:
+            return False
+
+    # Write next to the destination and rename over it, so that readers never see a partially written file:
+    tmp_path: Path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(content)
+    tmp_path.replace(path)
+    return True
+
 
 def generate_compile_commands_and_clangd_file(root_build_dir: Path) -> None:
     """Merges all found <build_dir>/<subdir>/compile_commands.json files into <build_dir>/compile_commands.json.
@@ -62,15 +83,18 @@ class Configuration:
         self.target: Target = target
         self.build_type: BuildType = build_type
         self.triplet: str = get_triplet(board, target, build_type)
-        self.root_build_dir: Path = self.target.parent_project.dir / "build" / self.triplet
+        self.root_build_dir: Path = self.target.parent_project.dir.joinpath("build", self.triplet)
         self.target_build_dir: Path = self.root_build_dir / self.target.build_subdir
         self._build_args_file: Path = self.target_build_dir / "build_args.txt"
+        self._cmake_args_file: Path = self.root_build_dir / "cmake_args.txt"
+        """CMake arguments that the build directory was last configured with."""
 
     def _save_build_args(self, build_args: list[str] | None) -> None:
         """Cache the latest build arguments for later rebuilds."""
-        with self._build_args_file.open("w") as f:
-            f.write(" ".join(build_args) if build_args else "")
-            log.inf(f"Cached build arguments into {f.name}")
+        if _write_if_changed(self._build_args_file, " ".join(build_args) if build_args else ""):
+            log.inf(f"Cached build arguments into {self._build_args_file}")
+        else:
+            log.dbg("Cached build arguments in %s are already up to date", self._build_args_file)
 
     def _load_cached_build_args(self) -> list[str]:
         """Load the cached build arguments for the target."""
@@ -83,16 +107,31 @@ class Configuration:
             log.inf(f"Build arguments file not found: {self._build_args_file}")
             return []
 
+    def _is_configured_with(self, cmake_args: str) -> bool:
+        """Whether the build directory has already been configured (successfully) with exactly these arguments.
+
+        The record is only trusted if the build directory has not been configured since it was written; e.g. a plain
+        'west build -- -DX=2' outside of gale rewrites the CMakeCache.txt, but not the record.
+        """
+        try:
+            cache_mtime: int = (self.root_build_dir / "CMakeCache.txt").stat().st_mtime_ns
+            record_mtime: int = self._cmake_args_file.stat().st_mtime_ns
+            if cache_mtime > record_mtime:
+                return False
+            return self._cmake_args_file.read_text() == cmake_args
+        except FileNotFoundError:
+            return False
+
     def _get_extra_args_for_build_type(self, build_type: BuildType) -> list[str]:
         if build_type == BuildType.SCA:
-            codechecker_config: Path = SHARED_PROJECT.dir / "share/codechecker/.codechecker.json"
-            codechecker_args: str = f"--skip={SHARED_PROJECT.dir}/share/codechecker/skipfile.txt "
+            codechecker_config: Path = _CODECHECKER_DIR / ".codechecker.json"
+            codechecker_args: str = f"--skip={_CODECHECKER_DIR / 'skipfile.txt'} "
             codechecker_args = codechecker_args.replace(" ", ";")  # Can't have spaces in args, semicolon is alternative
             sca_args: list[str] = [
                 "-DZEPHYR_SCA_VARIANT=codechecker",
                 f"-DCODECHECKER_NAME={self.target.name}",
                 f"-DCODECHECKER_CONFIG_FILE={codechecker_config}",
-                f"-DCODECHECKER_ANALYZE_OPTS='{codechecker_args}'",
+                f"-DCODECHECKER_ANALYZE_OPTS={codechecker_args}",  # Passed as a single argv entry; no shell quoting.
                 "-DCODECHECKER_PARSE_SKIP=1",
             ]
             return sca_args
@@ -133,19 +172,27 @@ class Configuration:
             extra_args = extra_args + self._load_cached_build_args()
         args: str = " ".join(extra_args) if extra_args else ""
 
+        # Passing any CMake arguments makes 'west build' re-run the (slow) CMake configure step; if the build
+        # directory is already configured with the very same arguments, leave them out so that only the build tool
+        # (Ninja) runs. Changes to the CMakeLists.txt files themselves are still picked up by Ninja's own regeneration
+        # rule, and --pristine can always be used to force a clean configure.
+        reconfigure: bool = pristine or cmake_only or not self._is_configured_with(args)
+        if not reconfigure:
+            log.dbg("Build directory already configured with the same arguments; skipping CMake configure.")
+
         self.target.pre_build(self.root_build_dir)
-        build_cmd: str = (
-            "west build"
-            + f" -s {self.target.parent_project.dir}"
-            + f" -d {self.root_build_dir}"
-            + f" -t {self.target.cmake_target}"
-            + f" -b {self.board.primary_board}"
-            + " --sysbuild"  # In case of nrf-sdk, sysbuild is implied by default, but can still set explicitly.
-            + (" --pristine" if pristine else "")
-            + (" --cmake-only" if cmake_only else "")
-            + " --"
-            + f" {args}"
-        )
+        build_cmd: list[str] = [
+            "west",
+            "build",
+            *("-s", str(self.target.parent_project.dir)),
+            *("-d", str(self.root_build_dir)),
+            *("-t", self.target.cmake_target),
+            *("-b", self.board.primary_board),
+            "--sysbuild",  # In case of nrf-sdk, sysbuild is implied by default, but can still set explicitly.
+            *(["--pristine"] if pristine else []),
+            *(["--cmake-only"] if cmake_only else []),
+            *(["--", *extra_args] if reconfigure else []),
+        ]
         build_res: CmdHandle = run_command(
             cmd=build_cmd,
             desc=f"Building target '{self.target.name}' for board '{self.board.name}'",
@@ -161,8 +208,14 @@ class Configuration:
             log.wrn(f"Failed to generate clangd file: {e}")
 
         if build_res.code != 0:
+            self._cmake_args_file.unlink(missing_ok=True)  # Configuration may have failed; don't trust it next time.
             log.fatal("Build failed")
 
+        # (Re)write the record after every successful build, even if unchanged, so that it is newer than the
+        # CMakeCache.txt; a build that was not reconfigured may still have had Ninja regenerate (rewrite) the cache,
+        # but then from the very same (recorded) arguments:
+        self._cmake_args_file.write_text(args)
+
         if save_extra_args_to_disk:
             self._save_build_args(extra_args)
 
@@ -50,6 +50,9 @@ PROJECTS: dict[ProjectEnum, Project] = {
     ProjectEnum.ZEPHYR: ZEPHYR_PROJECT,
 }
 
+USER_PROJECTS: tuple[Project, ...] = tuple(project for project in PROJECTS.values() if not project.upstream)
+"""Projects developed as part of Gale itself, i.e. all non-upstream projects."""
+
 
 def get_project(project: ProjectEnum) -> Project:
     return PROJECTS[project]
@@ -1,25 +1,27 @@
 import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
 from gale import log
+from gale.common import is_verbose
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Board:
     name: str
     """Human readable name without any semantic meaning."""
     primary_board: str
     """i.e. the primary core, i.e. the cpuapp core."""
+    is_bsim: bool = field(init=False)
+    """Whether this is a BabbleSim (simulated) board; derived from the name."""
 
-    @property
-    def is_bsim(self) -> bool:
-        return "bsim" in self.name
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "is_bsim", "bsim" in self.name)  # Frozen; can only be set like this.
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Project:
     name: str
     """Human readable name without any semantic meaning."""
@@ -32,7 +34,7 @@ class Project:
 Args = list[str] | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Target(ABC):
     name: str
     """Human readable name without any semantic meaning."""
@@ -66,26 +68,80 @@ def get_triplet(board: Board, target: Target, build_type: BuildType) -> str:
     return f"{board.name}_{target.name}_{build_type.value}"
 
 
+def _parse_cmake_cache_entry(line: bytes) -> tuple[str, str | None] | None:
+    """Parse a single `KEY:TYPE=VALUE` line of a CMakeCache.txt; returns None for comments, blanks and other lines.
+
+    Entries are split with two partitions, without involving the regex engine; parsed as raw bytes so that only the
+    extracted key and value are ever decoded into strings. An empty value is returned as None.
+    """
+    entry: bytes = line.strip()
+    if not entry or entry.startswith((b"#", b"//")):  # Most lines are comments or blank.
+        return None
+    lhs, eq, value = entry.partition(b"=")
+    key, colon, _type = lhs.partition(b":")
+    if not eq or not colon or not key or b" " in key or b"\t" in key:
+        return None
+    return key.decode(), value.decode() if value else None
+
+
 class CMakeCache:
     """Interface around CmakeCache.txt."""
 
+    __slots__: tuple[str, ...] = ("_content", "_lookups", "_values", "path")
+
     def __init__(self, path: Path) -> None:
         self.path: Path = path
-        self.values: dict[str, str | None] = {}
-        line_pattern: re.Pattern[str] = re.compile(r"^([^\s:]+):\w*=(.*)$")
+        self._values: dict[str, str | None] | None = None
+        self._content: bytes | None = None
+        self._lookups: dict[str, str | None] = {}
 
-        with path.open() as file:
-            for line in file:
-                match: re.Match[str] | None = line_pattern.match(line.strip())
-                if match:
-                    key, value = match.groups()
-                    self.values[key] = value if value else None
+    @property
+    def values(self) -> dict[str, str | None]:
+        """All entries of the cache; the file is only parsed once actually needed (i.e. on first access)."""
+        if self._values is None:
+            values: dict[str, str | None] = {}
+            # The whole file is read in one go (or reused, if try_get() already did) and split into lines in C:
+            if self._content is None:
+                self._content = self.path.read_bytes()
+            for line in self._content.splitlines():
+                entry: tuple[str, str | None] | None = _parse_cmake_cache_entry(line)
+                if entry is not None:
+                    values[entry[0]] = entry[1]  # A later definition of the same key overrides an earlier one.
+            self._values = values
+            self._content = None  # All lookups go through the parsed values from now on.
+        return self._values
+
+    def try_get(self, key: str) -> str | None:
+        """Return the value of the given key, or None if the cache does not define it (or defines it as empty).
+
+        Callers only ever need a handful of the thousands of entries, so unless the file has been fully parsed already,
+        the lines defining the key are searched for directly in the raw file content (which is read once), and the
+        result memoized. The found lines are parsed exactly like by the full parse, so both always agree.
+        """
+        if self._values is not None:
+            return self._values.get(key)
+        if key in self._lookups:
+            return self._lookups[key]
+
+        if self._content is None:
+            self._content = self.path.read_bytes()
+        # The regex only preselects candidate lines (with the same line breaks as splitlines()); whether, and as what,
+        # a line defines the key is up to the parser:
+        pattern: bytes = rb"(?:^|(?<=\r))\s*" + re.escape(key.encode()) + rb":[^\r\n]*"
+        value: str | None = None
+        for match in re.finditer(pattern, self._content, re.MULTILINE):
+            entry: tuple[str, str | None] | None = _parse_cmake_cache_entry(match.group())
+            if entry is not None and entry[0] == key:
+                value = entry[1]  # Keep the last definition, as the full parse does.
+        self._lookups[key] = value
+        return value
 
     def get(self, key: str) -> str:
-        try:
-            return str(self.values[key])
-        except KeyError:
+        """Return the value of the given key; terminates if the cache does not define it."""
+        value: str | None = self.try_get(key)
+        if value is None:
             log.fatal(f"CMakeCache {self.path} does not define {key}")
+        return value
 
     @property
     def gdb(self) -> str:
@@ -119,6 +175,8 @@ class CMakeCache:
 class BuildCache:
     """Stores generated values for a target, such as devicetree, kconfig or CMake values."""
 
+    __slots__: tuple[str, ...] = ("board", "build_dir", "build_type", "cmake_cache", "target", "triplet")
+
     def __init__(self, board: Board, target: Target, build_type: BuildType, build_dir: Path) -> None:
         self.board: Board = board
         """Board used for generating this cache."""
@@ -131,18 +189,20 @@ class BuildCache:
         self.build_dir: Path = build_dir
         """Directory where the compile_commands.json and other build artifacts are stored."""
 
-        if not self.build_dir.exists():
-            log.fatal(
-                f"Build directory for the target '{self.triplet}' does not exist",
-                dir=build_dir,
-                help="Run 'gale build' on the target first",
-            )
-
+        # An existing CMakeCache.txt implies an existing build directory, so a single stat covers the common case;
+        # the directory itself is only checked in order to report the more helpful error:
         cmake_cache_file: Path = build_dir / "CMakeCache.txt"
         if not cmake_cache_file.exists():
+            if not self.build_dir.exists():
+                log.fatal(
+                    f"Build directory for the target '{self.triplet}' does not exist",
+                    dir=build_dir,
+                    help="Run 'gale build' on the target first",
+                )
             log.fatal(f"CMakeCache for the target '{self.triplet}' does not exist", file=cmake_cache_file)
 
         self.cmake_cache: CMakeCache = CMakeCache(cmake_cache_file)
         """Dictionary of values parsed from the CMakeCache.txt file."""
 
-        log.dbg("CMakeCache parsed", cache=self.cmake_cache.values)
+        if is_verbose():  # Dumping the values would otherwise force a full parse even when none are needed.
+            log.dbg("CMakeCache parsed", cache=self.cmake_cache.values)
@@ -5,10 +5,11 @@ from typing import override
 from gale import log
 from gale.data.projects import HMI_APP_PROJECT, SENSOR_APP_PROJECT
 from gale.data.structs import BuildCache, Target
-from gale.tasks import task_run_app_in_bsim
 
 
 class RawTarget(Target):
+    __slots__: tuple[str, ...] = ()  # Keep the slotted layout of the base dataclass (no per-instance __dict__).
+
     @override
     def pre_build(self, root_build_dir: Path) -> None:
         log.inf(f"No post-configure steps to execute for {self.name}")
@@ -25,17 +26,22 @@ class RawTarget(Target):
 class AppTarget(Target):
     """A simple application target that consists of a single executable that can be flashed/simulated/debugged/etc."""
 
+    __slots__: tuple[str, ...] = ()
+
     @override
     def pre_build(self, root_build_dir: Path) -> None:
-        log.dbg(f"No pre-build steps to execute for {self.name}")
+        log.dbg("No pre-build steps to execute for %s", self.name)
 
     @override
     def post_build(self, cache: BuildCache) -> None:
-        log.dbg(f"No post-build steps to execute for {cache.triplet}")
+        log.dbg("No post-build steps to execute for %s", cache.triplet)
 
     @override
     def run(self, cache: BuildCache, *, gdb: bool, real_time: bool) -> None:
         if cache.board.is_bsim:
+            # Deferred: tasks pulls in the whole build/run machinery, which merely listing targets does not need.
+            from gale.tasks import task_run_app_in_bsim  # noqa: PLC0415
+
             task_run_app_in_bsim(cache, gdb=gdb, real_time=real_time)
         else:
             log.fatal("Direct running on board not yet implemented.")
@@ -1,106 +1,152 @@
 import logging
 import os
+import sys
+import threading
 from functools import cache
-from typing import Any, NoReturn
-
-import structlog
-from rich.console import Console
-from rich.text import Text
-from rich.theme import Theme
+from typing import TYPE_CHECKING, Any, NoReturn
 
 from gale.common import is_verbose
 
-_custom_log_themes = Theme(
-    {
-        "warning": "yellow",
-        "error": "red",
-        "critical": "red",
-        "info": "green",
-        "debug": "white",
-        "code": "dim white",
-    }
-)
+if TYPE_CHECKING:
+    # structlog and rich are only imported once something is actually logged (see get_logger() and _get_console());
+    # plenty of invocations, such as --help or shell completion, never log anything:
+    import structlog
+    from rich.console import Console
+
+_custom_log_themes: dict[str, str] = {
+    "warning": "yellow",
+    "error": "red",
+    "critical": "red",
+    "info": "green",
+    "debug": "white",
+    "code": "dim white",
+}
 
 
+@cache  # Only a few distinct rules (per box part, level and terminal width) are ever drawn; don't rebuild each time.
 def rule(
     fmt_left_middle_right: str,
     *,
     width: int,
     style: str,
-) -> Text:
+) -> str:
+    """Return a horizontal rule of the given width as console markup, e.g "╭──────╮" in the given style."""
     left = fmt_left_middle_right[0]
     middle = fmt_left_middle_right[1]
     right = fmt_left_middle_right[2]
-    rule_text = left + middle * (width - 2) + right
-    return Text(rule_text, style=style)
+    return f"[{style}]{left}{middle * (width - 2)}{right}[/]"
+
+
+@cache
+def _get_console() -> "Console":
+    """Return the console shared by all log records; constructing one parses the theme and probes the terminal."""
+    from rich.console import Console  # noqa: PLC0415
+    from rich.theme import Theme  # noqa: PLC0415
+
+    return Console(theme=Theme(_custom_log_themes))
+
+
+_console_lock: threading.Lock = threading.Lock()
+"""Serializes capturing on the shared console; records may be logged from multiple threads."""
+
+
+_LEVEL_PREFIX: dict[str, str] = {"warning": "WARNING: ", "error": "ERROR: "}
+"""Prefix for the event message of the given level; levels not listed here get none."""
+
+
+_HEADER_KEYS: frozenset[str] = frozenset(("level", "timestamp", "event"))
+"""Keys of a record that are rendered into its header line rather than as values."""
+
+
+@cache
+def _level_markup(level: str) -> tuple[str, str, str]:
+    """Return the static markup pieces of a record of the given level: (style tag, message prefix, row key tag).
+
+    These only depend on the level (of which there are a handful), so are built once rather than for every record.
+    """
+    return f"[{level}]", _LEVEL_PREFIX.get(level, ""), f"[{level}] "
 
 
 def _console_printer(
-    _logger: structlog.types.WrappedLogger,
+    _logger: "structlog.types.WrappedLogger",
     _method_name: str,
-    event_dict: structlog.types.EventDict,
+    event_dict: "structlog.types.EventDict",
 ) -> str:
-    console = Console(theme=_custom_log_themes)
-    console.begin_capture()
+    with _console_lock:
+        return _render(_get_console(), event_dict)
+
+
+def _render(console: "Console", event_dict: "structlog.types.EventDict") -> str:
     level: str = event_dict["level"]
-    match level:
-        case "warning":
-            lvl = "WARNING: "
-        case "error":
-            lvl = "ERROR: "
-        case _:
-            lvl = ""
-
-    # Print out the primary event message; derive color from error level:
-    fmt: str = f"[{level}][{event_dict['timestamp']}] {lvl}{event_dict['event']}[/]"
-    console.print(fmt)
-
-    # These values are already printed above, no need to duplicate them:
-    for key in ["level", "timestamp", "event"]:
-        if key in event_dict:
-            event_dict.pop(key)
-
-    # Print out event values as a custom table:
-    # This is a custom table because we do not want padding of any kind before each row,
-    # as such padding makes the values hard to copy from the CLI.
-    if event_dict:
-        for i, (key, value) in enumerate(event_dict.items()):
-            if i == 0:
-                console.print(rule("╭─╮", width=console.width, style=level))
+    timestamp: str = event_dict.get("timestamp", "")
+    event: str = event_dict.get("event", "")
+    # The header values are printed in the header line, no need to duplicate them below:
+    rows: list[tuple[str, Any]] = [(key, value) for key, value in event_dict.items() if key not in _HEADER_KEYS]
 
-            text: str = f"[{level}] {key}: [/][white]{value!s}[/]"
-            console.print(text)
+    # The primary event message; derive color from error level:
+    tag, prefix, row_tag = _level_markup(level)
+    lines: list[str] = [f"{tag}[{timestamp}] {prefix}{event}[/]"]
 
-            if i == len(event_dict) - 1:
-                console.print(rule("╰─╯", width=console.width, style=level))
-            else:
-                console.print(rule("├─┤", width=console.width, style=level))
+    if rows and not console.is_terminal:
+        # Output is redirected (e.g. CI logs or a pipe); box rules across the full width would just bloat the logs
+        # there, so append the values compactly to the header line instead; repr() keeps multi-line values (such as
+        # captured command output) on that single line, and escaping keeps brackets in them from reading as markup:
+        from rich.markup import escape  # noqa: PLC0415
 
+        lines[0] += " " + " ".join(f"{key}={escape(repr(value))}" for key, value in rows)
+
+    # Event values as a custom table:
+    # This is a custom table because we do not want padding of any kind before each row,
+    # as such padding makes the values hard to copy from the CLI.
+    elif rows:
+        width: int = console.width  # Queries the terminal size; the same for all rows of the record.
+        separator: str = rule("├─┤", width=width, style=level)
+        lines.append(rule("╭─╮", width=width, style=level))
+        for key, value in rows:
+            lines.append(f"{row_tag}{key}: [/][white]{value!s}[/]")
+            lines.append(separator)
+        lines[-1] = rule("╰─╯", width=width, style=level)
+
+    # Render the whole record in one go rather than line by line; when redirected, the width is arbitrary (80) so
+    # don't wrap the compact line at it either:
+    console.begin_capture()
+    console.print("\n".join(lines), soft_wrap=not console.is_terminal)
     return console.end_capture().strip()
 
 
 @cache
-def get_logger() -> structlog.types.FilteringBoundLogger:
+def get_logger() -> "structlog.types.FilteringBoundLogger":
+    import structlog  # noqa: PLC0415
+
+    # Stack and exception info are only of interest when debugging, and cost a frame walk/check per record:
+    debug_processors: list[structlog.types.Processor] = (
+        [structlog.processors.StackInfoRenderer(), structlog.dev.set_exc_info] if is_verbose() else []
+    )
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
-            structlog.processors.StackInfoRenderer(),
-            structlog.dev.set_exc_info,
+            *debug_processors,
             structlog.processors.TimeStamper(fmt="%H:%M:%S", utc=False),
             _console_printer,
         ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.NOTSET),
+        # Debug records are dropped by the bound logger itself (a no-op method) unless verbose:
+        wrapper_class=structlog.make_filtering_bound_logger(logging.DEBUG if is_verbose() else logging.INFO),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
-        cache_logger_on_first_use=False,
+        # Writes the rendered record straight to stdout, without print()'s argument handling:
+        logger_factory=structlog.WriteLoggerFactory(),
     )
-    return structlog.get_logger()
+    # Bind right away and hand out the concrete logger rather than structlog's lazy proxy, which would otherwise
+    # go through its __getattr__ on every call; enabling verbosity reconfigures by clearing this function's cache.
+    return structlog.get_logger().bind()
+
 
+def dbg(msg: str, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+    """Log a debug message; pass any values to interpolate as `args` (%-style) rather than pre-formatting `msg`.
 
-def dbg(msg: str, **kwargs: Any) -> None:  # noqa: ANN401
-    if is_verbose():
-        get_logger().debug(msg, **kwargs)
+    Debug records are usually filtered out, in which case formatting is skipped entirely.
+    """
+    get_logger().debug(msg, *args, **kwargs)
 
 
 def inf(msg: str, **kwargs: Any) -> None:  # noqa: ANN401
@@ -116,5 +162,13 @@ def err(msg: str, **kwargs: Any) -> None:  # noqa: ANN401
 
 
 def fatal(msg: str, **kwargs: Any) -> NoReturn:  # noqa: ANN401
-    err(msg, **kwargs)
-    os._exit(-1)
+    try:
+        err(msg, **kwargs)
+    except Exception:  # noqa: BLE001
+        # The reason for terminating must not get lost to a failure in the logging pipeline itself; write it raw:
+        sys.stderr.write("".join([f"FATAL: {msg}\n", *(f"  {key}: {value!s}\n" for key, value in kwargs.items())]))
+    # os._exit (rather than sys.exit) so that this also terminates the process when called from a worker thread;
+    # but it skips interpreter shutdown, so the buffered streams must be flushed by hand for the message to show up:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(1)
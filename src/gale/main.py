@@ -1,16 +1,16 @@
+import os
+import shlex
 from typing import TYPE_CHECKING, Annotated
 
 import typer
 
 from gale import log
 from gale.common import set_verbose
-from gale.configuration import Configuration
 from gale.data.boards import get_board
 from gale.data.paths import BSIM_DIR
-from gale.data.projects import PROJECTS, get_project
+from gale.data.projects import USER_PROJECTS, get_project
 from gale.data.structs import BuildType
 from gale.data.targets import RawTarget, get_target
-from gale.tasks import run_codechecker
 from gale.typer_args import (
     BaudrateArg,
     BoardArg,
@@ -35,8 +35,14 @@ from gale.util import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Future
+
     from gale.data.structs import BuildCache, Project, Target
+    from gale.util import CmdHandle
 
+# The build/run/debug machinery (and its imports) is only loaded by the commands that need it, inside their bodies;
+# --help, shell completion and the git commands do not pay for it.
 app: typer.Typer = typer.Typer(name="woid", rich_markup_mode="rich", no_args_is_help=True)
 
 
@@ -46,6 +52,49 @@ class CommandPanel:
     OTHER: str = "Other"
 
 
+_ENVIRONMENT_COMMANDS: frozenset[str] = frozenset(("build", "run", "cmake", "sca", "bindesc", "setup"))
+"""Commands that (through west, CMake or the BabbleSim makefiles) depend on the environment variables set by gale."""
+
+_MAX_PARALLEL_PROJECTS: int = 8
+"""Upper bound for projects processed at once; each spawns (git) subprocesses, which are not free either."""
+
+
+def _for_each_user_project(func: "Callable[[Project], CmdHandle | None]") -> None:
+    """Call `func` on every user (i.e. non-upstream) project concurrently.
+
+    The per-project work is independent and mostly waits on git/network I/O, so running it in parallel
+    brings the total time down to roughly that of the slowest project.
+
+    As output of concurrent commands would interleave, `func` shall run its commands in CAPTURE_RESULT mode and
+    return the handle of the last one (or None if there is nothing to report), stopping early if a command was
+    terminated; each project's result (including the stderr of a successful command, where git reports most of what
+    it did) is then reported here as a whole, as soon as that project is done, followed by a summary of the projects
+    that failed.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed  # noqa: PLC0415
+
+    failed: list[str] = []
+    with ThreadPoolExecutor(max_workers=min(len(USER_PROJECTS), _MAX_PARALLEL_PROJECTS)) as executor:
+        futures: dict[Future[CmdHandle | None], Project] = {
+            executor.submit(func, project): project for project in USER_PROJECTS
+        }
+        for future in as_completed(futures):
+            project: Project = futures[future]
+            res: CmdHandle | None = future.result()
+            if res is None:
+                continue
+            text: str = "\n".join(out for out in (res.stdout, res.stderr) if out)
+            output: dict[str, str] = {"output": text} if text else {}
+            if res.code == 0:
+                log.inf(f"Cmd `{res.cmd}` succeeded in project '{project.name}'", **output)
+            else:
+                log.err(f"Cmd `{res.cmd}` failed in project '{project.name}'", **output)
+                failed.append(project.name)
+
+    if failed:
+        log.err(f"Failed in {len(failed)} of {len(USER_PROJECTS)} projects", projects=", ".join(failed))
+
+
 @app.callback(invoke_without_command=True)
 def gale(
     ctx: typer.Context,
@@ -61,14 +110,17 @@ def gale(
     """Workspace management tool for Gale."""
     if verbose:
         set_verbose(True)
+        # The logger's level filter is derived from the verbosity when configured; reconfigure it on next use:
+        log.get_logger.cache_clear()
 
-    set_os_environment_vars()
+    if ctx.invoked_subcommand in _ENVIRONMENT_COMMANDS:
+        set_os_environment_vars()
 
     if not in_venv():
         log.fatal("This tool must be run from within a virtual environment; create and activate .venv as per README!")
 
     if ctx.invoked_subcommand:
-        log.dbg(f"Running command `{ctx.invoked_subcommand}`.")
+        log.dbg("Running command `%s`.", ctx.invoked_subcommand)
 
 
 @app.command(rich_help_panel=CommandPanel.GIT)
@@ -78,17 +130,36 @@ def checkout(branch: str) -> None:
     Useful during development when working with multiple repositories that should point to the same branch.
     Usage: gale checkout <branch>
     """
-    cmd: str = f"git fetch && git switch {branch} || git switch --track origin/{branch}"
-
-    user_projects: list[Project] = [project for project in PROJECTS.values() if not project.upstream]
-    for project in user_projects:
-        run_command(
-            cmd=cmd,
-            desc=f"Checking out branch '{branch}' in project '{project.name}'",
-            mode=CmdMode.FOREGROUND,
+
+    def _checkout(project: "Project") -> "CmdHandle":
+        # Equivalent of `git fetch && git switch <branch> || git switch --track origin/<branch>`, but without
+        # spawning a shell (and without having to quote the branch name for it):
+        res: CmdHandle = run_command(
+            cmd=["git", "fetch"],
+            desc=f"Fetching project '{project.name}'",
+            mode=CmdMode.CAPTURE_RESULT,
             cwd=project.dir,
             fatal=False,
         )
+        if res.code == 0:
+            res = run_command(
+                cmd=["git", "switch", branch],
+                desc=f"Checking out branch '{branch}' in project '{project.name}'",
+                mode=CmdMode.CAPTURE_RESULT,
+                cwd=project.dir,
+                fatal=False,
+            )
+        if res.code != 0 and not res.terminated:  # Interrupted (Ctrl+C) is not the same as branch not found locally.
+            res = run_command(
+                cmd=["git", "switch", "--track", f"origin/{branch}"],
+                desc=f"Checking out remote branch 'origin/{branch}' in project '{project.name}'",
+                mode=CmdMode.CAPTURE_RESULT,
+                cwd=project.dir,
+                fatal=False,
+            )
+        return res
+
+    _for_each_user_project(_checkout)
 
 
 @app.command(rich_help_panel=CommandPanel.GIT)
@@ -98,17 +169,50 @@ def push(message: str) -> None:
     Useful during development when working with multiple repositories.
     Usage: gale push <message>
     """
-    cmd: str = f'git add . && git commit -m "{message}" && git push'
-
-    user_projects: list[Project] = [project for project in PROJECTS.values() if not project.upstream]
-    for project in user_projects:
-        run_command(
-            cmd=cmd,
-            desc=f"Commiting and pushing changes in project '{project.name}'",
-            mode=CmdMode.FOREGROUND,
+
+    def _push(project: "Project") -> "CmdHandle | None":
+        # Most repositories are usually clean; one status query is cheaper than letting add+commit fail on them:
+        status: CmdHandle = run_command(
+            cmd=["git", "status", "--porcelain"],
+            desc=f"Checking for changes in project '{project.name}'",
+            mode=CmdMode.CAPTURE_RESULT,
             cwd=project.dir,
             fatal=False,
         )
+        if status.terminated:
+            return status
+        if status.code == 0 and not status.stdout:
+            log.inf(f"No changes to push in project '{project.name}'")
+            return None
+
+        # Equivalent of `git add . && git commit -m "<message>" && git push`, but without spawning a shell
+        # (and without having to quote the message for it):
+        res: CmdHandle = run_command(
+            cmd=["git", "add", "."],
+            desc=f"Staging changes in project '{project.name}'",
+            mode=CmdMode.CAPTURE_RESULT,
+            cwd=project.dir,
+            fatal=False,
+        )
+        if res.code == 0:
+            res = run_command(
+                cmd=["git", "commit", "-m", message],
+                desc=f"Committing changes in project '{project.name}'",
+                mode=CmdMode.CAPTURE_RESULT,
+                cwd=project.dir,
+                fatal=False,
+            )
+        if res.code == 0:
+            res = run_command(
+                cmd=["git", "push"],
+                desc=f"Pushing changes in project '{project.name}'",
+                mode=CmdMode.CAPTURE_RESULT,
+                cwd=project.dir,
+                fatal=False,
+            )
+        return res
+
+    _for_each_user_project(_push)
 
 
 @app.command(no_args_is_help=True, rich_help_panel=CommandPanel.PROJECT_DEVELOPMENT)
@@ -121,6 +225,8 @@ def build(
     extra_build_args: ExtraBuildArgs = None,
 ) -> None:
     """Build the given target, for the given board."""
+    from gale.configuration import Configuration  # noqa: PLC0415
+
     trgt: Target = get_target(target)
 
     conf: Configuration = Configuration(get_board(board), trgt, build_type)
@@ -137,6 +243,8 @@ def run(
     real_time: RealTimeArg = False,
 ) -> None:
     """Run the given target, for the given board."""
+    from gale.configuration import Configuration  # noqa: PLC0415
+
     trgt: Target = get_target(target)
     conf: Configuration = Configuration(get_board(board), trgt, build_type)
     cache: BuildCache = conf.build(load_extra_args_from_disk=True) if rebuild else conf.get_build_cache()
@@ -165,6 +273,8 @@ def cmake(
 
     This command is for testing and developing non-hardcoded-targets such as 'help'.
     """
+    from gale.configuration import Configuration  # noqa: PLC0415
+
     prj: Project = get_project(project)
     trgt: Target = RawTarget(
         name=cmake_target,
@@ -183,6 +293,8 @@ def sca(
     target: TargetArg,
 ) -> None:
     """Build project with SCA (Static Code Analysis) and analyze the results."""
+    from gale.tasks import run_codechecker  # noqa: PLC0415
+
     run_codechecker(get_board(board), get_target(target))
 
 
@@ -199,13 +311,15 @@ def bindesc(
     binary in such a way that it can be accessed externally. This tool is a simple wrapper/helper for accessing
     this data.
     """
+    from gale.configuration import Configuration  # noqa: PLC0415
+
     trgt: Target = get_target(target)
 
     conf: Configuration = Configuration(get_board(board), trgt, build_type)
     cache: BuildCache = conf.get_build_cache()
 
     run_command(
-        cmd=f"west bindesc {cmd} {cache.cmake_cache.bin_path}",
+        cmd=["west", "bindesc", *shlex.split(cmd), cache.cmake_cache.bin_path],
         desc=f"Running 'west bindesc {cmd}'",
         mode=CmdMode.FOREGROUND,
     )
@@ -217,9 +331,9 @@ def setup() -> None:
 
     Usage: gale setup
     """
-    # Build BabbleSim:
+    # Build BabbleSim, using all cores (the compile is CPU bound):
     run_command(
-        cmd="make everything -j 8",
+        cmd=["make", "everything", f"-j{os.cpu_count() or 1}"],
         desc="Building BabbleSim",
         mode=CmdMode.FOREGROUND,
         cwd=BSIM_DIR,
@@ -1,3 +1,4 @@
+import os
 import shutil
 import socket
 import time
@@ -10,6 +11,38 @@ from gale.data.projects import SHARED_PROJECT, ZEPHYR_PROJECT
 from gale.data.structs import Board, BuildCache, BuildType, Target
 from gale.util import CmdMode, run_command
 
+_GDBINIT_FILE: Path = SHARED_PROJECT.dir / "share" / "gdb" / ".gdbconf"
+"""Shared gdb init script used when debugging apps."""
+
+_TRACE_METADATA_FILE: Path = ZEPHYR_PROJECT.dir / "subsys" / "tracing" / "ctf" / "tsdl" / "metadata"
+"""Zephyr's CTF metadata file; must be placed next to the trace data for tools to be able to parse it."""
+
+
+def _link_tree(src: Path, dst: Path) -> None:
+    """Mirror the files of the `src` directory tree into `dst` as hard links, replacing whatever `dst` holds.
+
+    Equivalent to `shutil.copytree(src, dst, dirs_exist_ok=True)` for read-only content, except that no data is
+    copied; falls back to copying files that cannot be linked (e.g. if `dst` is on a different filesystem).
+    """
+    for dir_path, _dir_names, file_names in os.walk(src, followlinks=True):
+        dst_dir: Path = dst / Path(dir_path).relative_to(src)
+        dst_dir.mkdir(parents=True, exist_ok=True)
+        for file_name in file_names:
+            src_file: Path = Path(dir_path, file_name)
+            dst_file: Path = dst_dir / file_name
+            try:
+                if dst_file.samefile(src_file):
+                    continue  # Already linked by a previous run.
+                dst_file.unlink()
+            except FileNotFoundError:
+                pass
+            try:
+                dst_file.hardlink_to(src_file.resolve())  # Link the file itself in case of a symlink, like copytree.
+            except OSError:
+                # Only the content and permission bits matter (the tools must stay executable); skip copying the
+                # timestamps and extended attributes, which copy2 would also do:
+                shutil.copy(src_file, dst_file)
+
 
 def task_run_app_in_bsim(  # noqa: PLR0915
     cache: BuildCache,
@@ -38,8 +71,6 @@ def task_run_app_in_bsim(  # noqa: PLR0915
             if False, trace data is still be generated, but into an unspecified directory;
     """
     exe: Path = Path(cache.cmake_cache.exe_path)
-    if not exe.exists():
-        log.fatal(f"Output binary '{exe}' does not exist; use build first.")
 
     # Inputs:
     bsim_build_dir: Path = Path(cache.cmake_cache.bsim_out_path)
@@ -47,7 +78,7 @@ def task_run_app_in_bsim(  # noqa: PLR0915
     bsim_lib_dir: Path = bsim_build_dir / "lib"
 
     # Outputs:
-    final_dir: Path = cache.target.parent_project.dir / "bsim" / cache.triplet
+    final_dir: Path = cache.target.parent_project.dir.joinpath("bsim", cache.triplet)
     final_bin_dir: Path = final_dir / "bin"
     final_lib_dir: Path = final_dir / "lib"
     final_results_dir: Path = final_dir / "results"
@@ -55,7 +86,7 @@ def task_run_app_in_bsim(  # noqa: PLR0915
     final_dir.mkdir(parents=True, exist_ok=True)
     final_results_dir.mkdir(parents=True, exist_ok=True)
 
-    common_args = ""
+    common_args: list[str] = []
 
     # All devices shall be "linked together" by the same simulation ID;
     # Once the phy is executed, all devices with the same simulation ID will share the same phy:
@@ -63,36 +94,39 @@ def task_run_app_in_bsim(  # noqa: PLR0915
     num_devices: int = 0
 
     # 1. Prepare simulation environment by copying the bsim binaries and libraries to the final folder:
-    log.dbg(f"Preparing to run executable inside {final_bin_dir}")
-    shutil.copytree(bsim_bin_dir, final_bin_dir, dirs_exist_ok=True)
-    shutil.copytree(bsim_lib_dir, final_lib_dir, dirs_exist_ok=True)
+    log.dbg("Preparing to run executable inside %s", final_bin_dir)
+    # These are the (large) BabbleSim tools, which are only ever read; link rather than copy them:
+    _link_tree(bsim_bin_dir, final_bin_dir)
+    _link_tree(bsim_lib_dir, final_lib_dir)
 
     # 2. Copy the app device itself to the final folder:
-    log.dbg(f"Copying executable from {exe}")
-    final_exe: str = str(shutil.copy(exe, final_bin_dir))
+    log.dbg("Copying executable from %s", exe)
+    try:
+        final_exe: str = str(shutil.copy(exe, final_bin_dir))
+    except FileNotFoundError:  # The copy has to open it anyway; no need to stat it separately beforehand.
+        log.fatal(f"Output binary '{exe}' does not exist; use build first.")
 
     # 3. Prepare tracing if required:
     if tracing:
         # Copy Zephyr's metadata file to same directory as our final trace data file:
-        trace_metadata = f"{ZEPHYR_PROJECT.dir / 'subsys/tracing/ctf/tsdl/metadata'}"
-        shutil.copy(trace_metadata, final_results_dir / "metadata")
+        shutil.copy(_TRACE_METADATA_FILE, final_results_dir / "metadata")
 
         # Tell application to output trace data to custom file:
         trace_file_arg = f"--trace-file={final_results_dir}/trace_data"
-        common_args += f" {trace_file_arg}"
+        common_args.append(trace_file_arg)
 
     # Use a well-defined path for the flash binary, which is used for persistent storage of flash data:
     if cache.board == NRF5340_BSIM_BOARD:
         # This board needs to separate flash files for app and net domains:
-        simulated_flash_bin_arg: str = (
-            f"--flash_app_file={final_results_dir}/flash_app.bin"
-            + f" --flash_net_file={final_results_dir}/flash_net.bin"
-        )
+        simulated_flash_bin_args: list[str] = [
+            f"--flash_app_file={final_results_dir}/flash_app.bin",
+            f"--flash_net_file={final_results_dir}/flash_net.bin",
+        ]
     else:
         # Assume a single argument; although this may also vary depending on hw models;
-        simulated_flash_bin_arg = f"--flash_file={final_results_dir}/flash.bin"
+        simulated_flash_bin_args = [f"--flash_file={final_results_dir}/flash.bin"]
 
-    common_args += f" {simulated_flash_bin_arg}"
+    common_args.extend(simulated_flash_bin_args)
 
     # How often the handbrake triggers or "pokes" the simulation:
     # Decreasing improves responsiveness, but increases overhead; should not be reduced below 2ms.
@@ -101,24 +135,23 @@ def task_run_app_in_bsim(  # noqa: PLR0915
         # MRO: Max Resync Offset; determines max offset from PHY time before the app must resync;
         # default value is 1sec, but lowering this makes the app more responsive,
         # which is especially important if using handbrake and responsiveness is needed.
-        common_args += f" --mro={bsim_handbrake_interval_nsec}"
+        common_args.append(f"--mro={bsim_handbrake_interval_nsec}")
 
     # 4. Run application device itself:
     if gdb:
-        gdbinit: Path = SHARED_PROJECT.dir / "share" / "gdb" / ".gdbconf"
         # In case of debugging, we cannot attach to UART in the same terminal as gdb, so instead we
         # print out a message instructing the user to attach the UART, and wait until it is attached.
         # TODO: Can launch with gdbserver instead in the future if want to attach from IDE.
         uart_attach_cmd: str = r"echo App\ halted\ until\ UART\ attached!\ Use:\ gale\ monitor\ --port\ %s"
-        uart_args = (
-            "--uart_pty_wait"
-            + f' --uart0_pty_attach_cmd="{uart_attach_cmd}"'
-            + f' --uart1_pty_attach_cmd="{uart_attach_cmd}"'
-        )
-        app_run_cmd: str = (
-            f"{cache.cmake_cache.gdb} --tui -x {gdbinit} --args "
-            f"{final_exe} -s={sim_id} -d={num_devices} {uart_args} {common_args}"
-        )
+        uart_args: list[str] = [
+            "--uart_pty_wait",
+            f"--uart0_pty_attach_cmd={uart_attach_cmd}",
+            f"--uart1_pty_attach_cmd={uart_attach_cmd}",
+        ]
+        app_run_cmd: list[str] = [
+            *(cache.cmake_cache.gdb, "--tui", "-x", str(_GDBINIT_FILE), "--args"),
+            *(final_exe, f"-s={sim_id}", f"-d={num_devices}", *uart_args, *common_args),
+        ]
         num_devices += 1
         run_command(
             cmd=app_run_cmd,
@@ -129,13 +162,13 @@ def task_run_app_in_bsim(  # noqa: PLR0915
     else:
         # In case of running directly, attach the UART immediately:
         uart_attach_cmd = "gale monitor --port %s --new-terminal"
-        uart_args = (
-            "--uart_pty_wait"
-            + f' --uart1_pty_attach_cmd="{uart_attach_cmd}"'
-            + f' --uart4_pty_attach_cmd="{uart_attach_cmd}"'
-        )
+        uart_args = [
+            "--uart_pty_wait",
+            f"--uart1_pty_attach_cmd={uart_attach_cmd}",
+            f"--uart4_pty_attach_cmd={uart_attach_cmd}",
+        ]
 
-        app_run_cmd = f"{final_exe} -s={sim_id} -d={num_devices} {uart_args} {common_args}"
+        app_run_cmd = [final_exe, f"-s={sim_id}", f"-d={num_devices}", *uart_args, *common_args]
         num_devices += 1
         run_command(
             cmd=app_run_cmd,
@@ -146,9 +179,12 @@ def task_run_app_in_bsim(  # noqa: PLR0915
 
     # 5. Run the handbrake device, if real time is requested:
     if real_time:
-        handbrake_run_cmd: str = (
-            f"./bs_device_handbrake -s={sim_id} -d={num_devices} --pp={bsim_handbrake_interval_nsec}"
-        )
+        handbrake_run_cmd: list[str] = [
+            "./bs_device_handbrake",
+            f"-s={sim_id}",
+            f"-d={num_devices}",
+            f"--pp={bsim_handbrake_interval_nsec}",
+        ]
         num_devices += 1
         run_command(
             cmd=handbrake_run_cmd,
@@ -158,7 +194,7 @@ def task_run_app_in_bsim(  # noqa: PLR0915
         )
 
     # 6. Run the PHY itself, which starts the simulation proper:
-    phy_run_cmd: str = f"./bs_2G4_phy_v1 -s={sim_id} -D={num_devices}"
+    phy_run_cmd: list[str] = ["./bs_2G4_phy_v1", f"-s={sim_id}", f"-D={num_devices}"]
     run_command(
         cmd=phy_run_cmd,
         desc="Starting BabbleSim PHY",
@@ -168,15 +204,21 @@ def task_run_app_in_bsim(  # noqa: PLR0915
 
 
 def is_localhost_port_open(port: int, timeout: float = 10.0) -> bool:
-    start: float = time.time()
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(timeout)
-        while time.time() - start < timeout:
-            res: int = s.connect_ex(("localhost", port))
-            if res == 0:
+    """Wait until something accepts connections on the given localhost port, or until the timeout expires."""
+    deadline: float = time.monotonic() + timeout
+    delay: float = 0.005
+    while True:
+        # A socket whose connect failed cannot portably be connected again; use a fresh one for each attempt:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.settimeout(0.05)  # Connecting to localhost either succeeds or is refused right away.
+            if s.connect_ex(("localhost", port)) == 0:
                 return True
-            time.sleep(0.1)
-    return False
+        remaining: float = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # Back off exponentially, starting small so that a server that comes up quickly is noticed quickly:
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.1)
 
 
 def run_codechecker(board: Board, target: Target) -> None:
@@ -194,7 +236,7 @@ def run_codechecker(board: Board, target: Target) -> None:
 
     # 2. Start the CodeChecker server
     run_command(
-        cmd=f"{cache.cmake_cache.codechecker_exe} server",
+        cmd=[cache.cmake_cache.codechecker_exe, "server"],
         desc="Starting CodeChecker server",
         cwd=cache.build_dir,
         mode=CmdMode.SPAWN_NEW_TERMINAL,
@@ -207,7 +249,7 @@ def run_codechecker(board: Board, target: Target) -> None:
     # 3. Store the analysis results into the CodeChecker server
     sca_results_dir: Path = cache.build_dir / "sca" / "codechecker" / "codechecker.plist"
     run_command(
-        cmd=f"{cache.cmake_cache.codechecker_exe} store {sca_results_dir} -n {target.name}",
+        cmd=[cache.cmake_cache.codechecker_exe, "store", str(sca_results_dir), "-n", target.name],
         desc="Storing analysis results into CodeChecker server",
         cwd=cache.build_dir,
         mode=CmdMode.FOREGROUND,
@@ -215,7 +257,7 @@ def run_codechecker(board: Board, target: Target) -> None:
 
     # 4. Open localhost:8001 in native browser
     run_command(
-        cmd="open http://localhost:8001",
+        cmd=["open", "http://localhost:8001"],
         desc="Opening CodeChecker in browser",
         cwd=cache.build_dir,
         mode=CmdMode.FOREGROUND,
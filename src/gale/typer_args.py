@@ -1,7 +1,6 @@
 from typing import Annotated
 
 import typer
-from serial.tools.list_ports import comports
 
 from gale.data.boards import BoardEnum
 from gale.data.projects import ProjectEnum
@@ -110,6 +109,9 @@ RealTimeArg = Annotated[
 
 
 def _available_ports(incomplete: str) -> list[str]:
+    # Only needed when actually completing a port; pyserial's port enumeration is not worth importing otherwise:
+    from serial.tools.list_ports import comports  # noqa: PLC0415
+
     ports: list[str] = [port.device for port in comports()]
     return [p for p in ports if p.startswith(incomplete)]
 
@@ -124,9 +126,12 @@ PortArg = Annotated[
 ]
 
 
+_COMMON_BAUDRATES: tuple[str, ...] = ("9600", "115200", "250000")
+"""Baud rates offered when completing --baud."""
+
+
 def _common_baudrates(incomplete: str) -> list[str]:
-    bauds: list[str] = ["9600", "115200", "250000"]
-    return [b for b in bauds if b.startswith(incomplete)]
+    return [b for b in _COMMON_BAUDRATES if b.startswith(incomplete)]
 
 
 BaudrateArg = Annotated[
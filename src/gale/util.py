@@ -1,18 +1,18 @@
 import os
-import pty
+import select
 import shlex
 import signal
 import subprocess
 import sys
+import time
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import partial
 from pathlib import Path
-from threading import Semaphore, Thread
+from threading import Event, Thread, current_thread, main_thread
 from typing import Any, Never
 
 from gale import log
-from gale.data.paths import GALE_ROOT_DIR
+from gale.data.paths import BSIM_DIR, GALE_ROOT_DIR
 from gale.data.projects import ZEPHYR_PROJECT
 
 
@@ -22,22 +22,33 @@ def in_venv() -> bool:
 
 @dataclass
 class CmdHandle:
-    ready: Semaphore = field(default_factory=Semaphore)
-    """Given when process results are available; depending on mode, this may never be given."""
+    ready: Event = field(default_factory=Event)
+    """Set when process results are available; depending on mode, this may never be set."""
     thread: Thread | None = field(default=None)
-    """Thread running the command."""
-    proc: subprocess.Popen[str] | None = field(default=None)
+    """Thread running the command; commands waited for by a worker thread are run on that thread instead."""
+    proc: subprocess.Popen[bytes] | None = field(default=None)
     """Process running the command."""
     cmd: str = field(default="")
     """Raw command being executed, i.e `west update`."""
 
     code: int = field(default=0)
-    """Exit code of the command; only valid when `ready` is given."""
+    """Exit code of the command; only valid when `ready` is set."""
     stdout: str = field(default="")
-    """Stdout or stderr of the command; only valid when `ready` is given."""
+    """Stdout or stderr of the command; only valid when `ready` is set."""
+    stderr: str = field(default="")
+    """Stderr of a successful command (on failure it is given as `stdout`); only valid when `ready` is set.
+
+    Many tools, such as git, report their progress and results there rather than on stdout.
+    """
+
+    @property
+    def terminated(self) -> bool:
+        """Whether the command was terminated (e.g. interrupted by Ctrl+C) rather than having exited by itself."""
+        return self.code in (-signal.SIGINT, -signal.SIGTERM)
 
 
 _CMD_HISTORY: list[CmdHandle] = []
+"""Commands that are currently running, oldest first; finished commands remove themselves, see _run_actual()."""
 
 
 class CmdMode(Enum):
@@ -48,42 +59,50 @@ class CmdMode(Enum):
     REPLACE = 5  # Terminate Python and replace the terminal with the given command;
 
 
+def _decode(output: bytes | None) -> str:
+    """Decode captured process output in one go (rather than through a text-mode wrapper while reading)."""
+    return output.decode("utf-8", errors="replace").strip() if output else ""
+
+
 def _run_actual(
-    cmd: str,
+    args: list[str],
     cwd: Path,
     pipe: int | None,
     cmd_handle: CmdHandle,
 ) -> None:
     """Wrapper around a subprocess.
 
-    When the process finishes, fills out the handle's code and stdout/stderr fields, and gives the ready semaphore.
+    When the process finishes, fills out the handle's code and stdout/stderr fields, and sets the ready event.
+    The arguments are executed directly, without an intermediate shell.
     """
-    with cmd_handle.ready:
-        try:
-            cmd_handle.proc = subprocess.Popen(  # noqa: S602
-                cmd,
-                shell=True,
-                cwd=cwd,
-                text=True,
-                stdout=pipe,
-                stderr=pipe,
-                stdin=pipe,
-                env=os.environ,
-            )
-            stdout, stderr = cmd_handle.proc.communicate()
-            cmd_handle.proc.wait()
-            cmd_handle.code = cmd_handle.proc.returncode
-
-            if cmd_handle.code == 0:
-                cmd_handle.stdout = stdout.strip() if stdout else f"code {cmd_handle.code}"
-            elif cmd_handle.code in (-signal.SIGINT, -signal.SIGTERM):
-                log.wrn(f"Command `{cmd_handle.cmd}` was terminated")
-            else:
-                cmd_handle.stdout = stderr.strip() if stderr else f"code {cmd_handle.code}"
-
-        except FileNotFoundError:
-            cmd_handle.code = 1
-            cmd_handle.stdout = f"Invalid working directory {cwd}"
+    try:
+        cmd_handle.proc = subprocess.Popen(  # noqa: S603
+            args,
+            cwd=cwd,
+            stdout=pipe,
+            stderr=pipe,
+            stdin=pipe,
+        )
+        stdout, stderr = cmd_handle.proc.communicate()  # Also waits for the process to exit.
+        cmd_handle.code = cmd_handle.proc.returncode
+
+        if cmd_handle.code == 0:
+            cmd_handle.stdout = _decode(stdout)
+            cmd_handle.stderr = _decode(stderr)
+        elif cmd_handle.terminated:
+            log.wrn(f"Command `{cmd_handle.cmd}` was terminated")
+        else:
+            cmd_handle.stdout = _decode(stderr) or f"code {cmd_handle.code}"
+
+    except OSError as e:
+        # The working directory or the executable does not exist, is not accessible or cannot be executed:
+        cmd_handle.code = 1
+        cmd_handle.stdout = str(e)
+
+    finally:
+        # Nothing left for _cleanup() to terminate; also don't keep the process and its output alive:
+        _CMD_HISTORY.remove(cmd_handle)
+        cmd_handle.ready.set()
 
 
 def _run_in_new_terminal(cmd: str) -> str:
@@ -92,7 +111,7 @@ def _run_in_new_terminal(cmd: str) -> str:
     e.g 'ls -l' might become 'konsole -e "ls -l"'
     """
     if sys.platform.startswith("linux"):
-        return f"konsole --hold -e '{cmd}'"
+        return f"konsole --hold -e {shlex.quote(cmd)}"
 
     msg: str = f"Unsupported platform: {sys.platform}"
     raise NotImplementedError(msg)
@@ -100,7 +119,7 @@ def _run_in_new_terminal(cmd: str) -> str:
 
 def run_command(
     *,  # Force all arguments to be keyword-typed for clarity and consistency.
-    cmd: str,
+    cmd: str | list[str],
     desc: str,
     mode: CmdMode,
     cwd: Path | None = None,
@@ -111,7 +130,9 @@ def run_command(
     Only OS agnostic commands (such as git, python or west) should be used.
 
     Args:
-        cmd: command string, e.g "apt install python";
+        cmd: argument list, e.g ["apt", "install", "python"]; or a command string, e.g "apt install python", which is
+            split into arguments with shell-like syntax (shlex); either way the command is executed directly, without
+            an intermediate shell, so shell features such as pipes or `&&` are not available;
         desc: human readable description of what the command is doing;
         mode: determines how the command is run and how the result is handled; see enum;
         cwd: directory to run command in; defaults to WEST_TOPDIR;
@@ -120,76 +141,118 @@ def run_command(
     if cwd is None:
         cwd = GALE_ROOT_DIR
 
-    cmd_handle = CmdHandle()
-    cmd_handle.cmd = cmd
+    # Split (or join) once; the argument list is what gets executed, the string is what gets logged:
+    args: list[str] = shlex.split(cmd) if isinstance(cmd, str) else cmd
+    cmd_str: str = cmd if isinstance(cmd, str) else shlex.join(cmd)
 
-    _CMD_HISTORY.append(cmd_handle)
+    cmd_handle = CmdHandle()
+    cmd_handle.cmd = cmd_str
 
     pipe: int | None = 0
     if mode == CmdMode.BACKGROUND:
+        import pty  # noqa: PLC0415  # Only needed for background commands; keep it off the common import path.
+
         pipe, slave_fd = pty.openpty()
         slave_name = os.ttyname(slave_fd)
-        log.inf(f"Running command in background ({slave_name}).", desc=desc, cmd=cmd, cwd=cwd)
+        log.inf(f"Running command in background ({slave_name}).", desc=desc, cmd=cmd_str, cwd=cwd)
     elif mode == CmdMode.FOREGROUND:
         pipe = None
-        log.inf("Running command in foreground.", desc=desc, cmd=cmd, cwd=cwd)
+        log.inf("Running command in foreground.", desc=desc, cmd=cmd_str, cwd=cwd)
     elif mode == CmdMode.SPAWN_NEW_TERMINAL:
-        cmd = _run_in_new_terminal(cmd)
-        args: list[str] = shlex.split(cmd)
+        cmd_str = _run_in_new_terminal(cmd_str)
+        terminal_args: list[str] = shlex.split(cmd_str)
         os.chdir(cwd)
-        pid: int = os.spawnvpe(os.P_NOWAIT, args[0], args, os.environ)  # noqa: S606
+        pid: int = os.spawnvp(os.P_NOWAIT, terminal_args[0], terminal_args)  # noqa: S606
         log.inf(
             "Running command as a detached process (new terminal).",
             desc=desc,
-            cmd=cmd,
+            cmd=cmd_str,
             cwd=cwd,
             pid=pid,
         )
         return cmd_handle
     elif mode == CmdMode.REPLACE:
-        # This will terminate the current Python process, and instead pass the path and environment
+        # This will terminate the current Python process, and instead pass the path and (inherited) environment
         # to the new process that shall inherit this terminal. This is required for cases where
         # Python causes issues as the middle-man (e.g. catching interrupt signals, etc).
-        log.inf("Running command in foreground (replacing Python!).", desc=desc, cmd=cmd, cwd=cwd)
+        log.inf("Running command in foreground (replacing Python!).", desc=desc, cmd=cmd_str, cwd=cwd)
         os.chdir(cwd)
-        args = shlex.split(cmd)
-        os.execvpe(args[0], args, os.environ)  # noqa: S606
+        os.execvp(args[0], args)  # noqa: S606
     else:
-        log.dbg("Running command for its stdout value.", cmd=cmd)
+        log.dbg("Running command for its stdout value.", cmd=cmd_str)
         pipe = subprocess.PIPE
 
-    cmd_handle.thread = Thread(
-        target=partial(
-            _run_actual,
-            cmd=cmd,
-            cwd=cwd,
-            pipe=pipe,
-            cmd_handle=cmd_handle,
-        )
-    )
-    cmd_handle.thread.start()
-
-    if mode == CmdMode.BACKGROUND:
-        return cmd_handle  # Caller is responsible for checking the code and stdout!
-
-    # Otherwise wait for the command to finish:
-    cmd_handle.thread.join()
+    # Only the commands run (and waited for) by _run_actual() are tracked; detached or replacing ones are not ours:
+    _CMD_HISTORY.append(cmd_handle)
+    if mode == CmdMode.BACKGROUND or current_thread() is main_thread():
+        cmd_handle.thread = Thread(target=_run_actual, args=(args, cwd, pipe, cmd_handle))
+        cmd_handle.thread.start()
+        if mode == CmdMode.BACKGROUND:
+            return cmd_handle  # Caller is responsible for checking the code and stdout!
+
+        # The interrupt handler, _cleanup(), runs on the main thread; were the main thread itself waiting on the
+        # process (inside Popen, which holds its wait lock meanwhile), the handler could neither reap nor wait for it:
+        cmd_handle.thread.join()
+    else:
+        # Already on a worker thread (e.g. from _for_each_user_project()), which waits anyway; no need for another:
+        _run_actual(args=args, cwd=cwd, pipe=pipe, cmd_handle=cmd_handle)
     if fatal and cmd_handle.code != 0:
         log.fatal(f"Cmd `{cmd_handle.cmd}` failed: {cmd_handle.stdout}")
     return cmd_handle
 
 
+def _wait_all(procs: list[subprocess.Popen[bytes]], timeout: float) -> list[subprocess.Popen[bytes]]:
+    """Wait for all the given processes to exit, up to `timeout` seconds in total; returns those still running.
+
+    Where supported (Linux), the processes are waited on all at once through their pidfds, rather than one after
+    another by polling each of them.
+    """
+    deadline: float = time.monotonic() + timeout
+    if hasattr(os, "pidfd_open"):
+        poller: select.poll = select.poll()
+        pidfds: dict[int, subprocess.Popen[bytes]] = {}
+        for proc in procs:
+            try:
+                pidfd: int = os.pidfd_open(proc.pid)
+            except OSError:  # E.g. an old kernel; the process is then waited for below instead.
+                continue
+            pidfds[pidfd] = proc
+            poller.register(pidfd, select.POLLIN)
+        while pidfds and (remaining := deadline - time.monotonic()) > 0:
+            for pidfd, _event in poller.poll(remaining * 1000):  # A pidfd is readable once its process has exited.
+                poller.unregister(pidfd)
+                os.close(pidfd)
+                pidfds.pop(pidfd).poll()  # Reap it.
+        for pidfd in pidfds:
+            os.close(pidfd)
+
+    still_running: list[subprocess.Popen[bytes]] = []
+    for proc in procs:
+        try:
+            proc.wait(max(deadline - time.monotonic(), 0))  # Returns right away for those that exited above.
+        except subprocess.TimeoutExpired:
+            still_running.append(proc)
+    return still_running
+
+
 def _cleanup(signal_number: int, _frame: Any) -> Never:  # noqa: ANN401
     log.wrn(f"Received signal {signal_number}. Terminating ongoing processes...")
-    # Terminate in reverse order since newer commands may depend on older ones:
-    for cmd in reversed(_CMD_HISTORY):
-        if cmd.proc and cmd.proc.poll() is None:
-            try:
-                cmd.proc.wait(0.1)
-            except subprocess.TimeoutExpired:
-                cmd.proc.send_signal(signal.SIGTERM)
-                cmd.proc.wait(0.1)
+    # Background commands remove themselves from the history (on their own threads) as they finish, which would
+    # make iterating the history itself skip entries; work on a snapshot (copying a list is atomic) instead:
+    commands: list[CmdHandle] = _CMD_HISTORY.copy()
 
+    # Terminate in reverse order since newer commands may depend on older ones:
+    running: list[subprocess.Popen[bytes]] = [
+        cmd.proc for cmd in reversed(commands) if cmd.proc and cmd.proc.poll() is None
+    ]
+    # The interrupt reaches the whole (foreground) process group, so give the processes a moment to exit by themselves
+    # before terminating the rest; both waits are shared by all processes, rather than taken by each in turn:
+    running = _wait_all(running, timeout=0.1)
+    for proc in running:
+        proc.send_signal(signal.SIGTERM)
+    _wait_all(running, timeout=0.1)
+
+    for cmd in reversed(commands):
         if cmd.thread:
             cmd.thread.join()
     sys.exit(0)
@@ -201,13 +264,13 @@ signal.signal(signal.SIGINT, _cleanup)
 def install_system_packages(packages: list[str]) -> None:
     """A work-in-progress function to install system packages in an OS-agnostic way."""
     if sys.platform.startswith("linux"):
-        exe = "sudo apt install"
+        exe: list[str] = ["sudo", "apt", "install"]
     else:
         msg: str = f"Unsupported platform: {sys.platform}"
         raise NotImplementedError(msg)
 
     run_command(
-        cmd=" ".join([exe, *packages]),
+        cmd=[*exe, *packages],
         desc=f"Installing system packages: {packages}",
         mode=CmdMode.FOREGROUND,
     )
@@ -216,7 +279,7 @@ def install_system_packages(packages: list[str]) -> None:
 def serial_monitor(*, port: str, baud: int, spawn_new_terminal: bool = False) -> None:
     """A work-in-progress function to monitor a serial port in an OS-agnostic way."""
     if sys.platform.startswith("linux"):
-        cmd = f"picocom -b {baud} {port}"
+        cmd: list[str] = ["picocom", "-b", str(baud), port]
     else:
         msg: str = f"Unsupported platform: {sys.platform}"
         raise NotImplementedError(msg)
@@ -229,13 +292,10 @@ def serial_monitor(*, port: str, baud: int, spawn_new_terminal: bool = False) ->
 
 
 def set_os_environment_vars() -> None:
-    zephyr_dir: Path = ZEPHYR_PROJECT.dir
-    bsim_out_path: Path = ZEPHYR_PROJECT.dir / "../tools/bsim"
-    bsim_components_path: Path = bsim_out_path / "components"
-
-    os.environ["ZEPHYR_BASE"] = str(zephyr_dir.absolute())
-    os.environ["BSIM_OUT_PATH"] = str(bsim_out_path.absolute())
-    os.environ["BSIM_COMPONENTS_PATH"] = str(bsim_components_path.absolute())
+    # All of these are derived from GALE_ROOT_DIR, which is already absolute; no need to resolve them again:
+    os.environ["ZEPHYR_BASE"] = str(ZEPHYR_PROJECT.dir)
+    os.environ["BSIM_OUT_PATH"] = str(BSIM_DIR)
+    os.environ["BSIM_COMPONENTS_PATH"] = str(BSIM_DIR / "components")
 
     log.inf(
         "Set environment variables",